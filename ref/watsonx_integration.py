@@ -1,11 +1,15 @@
 from __future__ import annotations
 
-from datetime import datetime
+import asyncio
+import time
+from datetime import datetime, timezone
+from itertools import chain
 from typing import AsyncIterator, Dict, Any
 from contextlib import asynccontextmanager
 from collections.abc import AsyncIterator as AsyncIteratorType
 
-from ibm_watsonx_ai import Credentials
+import httpx
+from ibm_watsonx_ai import APIClient, Credentials
 from ibm_watsonx_ai.foundation_models import ModelInference as WatsonModelInference
 from pydantic_ai.models import (
     Model,
@@ -21,6 +25,59 @@ from pydantic_ai.messages import (
 )
 from pydantic_ai.settings import ModelSettings
 
+_MISSING = object()
+_EMPTY: dict = {}
+
+
+def _system_prompt_to_watson(part: Any) -> dict:
+    return {"role": "system", "content": part.content}
+
+
+def _user_prompt_to_watson(part: Any) -> dict:
+    return {"role": "user", "content": part.content}
+
+
+def _tool_return_to_watson(part: Any) -> dict:
+    # For tool returns, we'll format them as assistant responses
+    return {"role": "assistant", "content": part.model_response_str()}
+
+
+def _retry_prompt_to_watson(part: Any) -> dict:
+    # For retry prompts, we'll format them as user messages
+    if isinstance(part.content, str):
+        content = part.content
+    else:
+        content = part.model_response()
+    return {"role": "user", "content": content}
+
+
+def _content_to_str(content: Any) -> str:
+    """Render part content as text, skipping str() for the common types."""
+    content_type = type(content)
+    if content_type is str:
+        return content
+    if content_type is bytes:
+        return content.decode('utf-8', 'replace')
+    if content_type is list and all(type(item) is str for item in content):
+        return ''.join(content)
+    return str(content)
+
+
+def _unknown_part_to_watson(part: Any) -> dict:
+    content = getattr(part, 'content', _MISSING)
+    if content is _MISSING:
+        return {"role": "user", "content": str(part)}
+    return {"role": "user", "content": _content_to_str(content)}
+
+
+# Maps pydantic-ai part kinds to their WatsonX.ai converters
+_KIND_HANDLERS = {
+    "system-prompt": _system_prompt_to_watson,
+    "user-prompt": _user_prompt_to_watson,
+    "tool-return": _tool_return_to_watson,
+    "retry-prompt": _retry_prompt_to_watson,
+}
+
 class WatsonXModel(Model):
     """Implementation of IBM WatsonX.ai model for pydantic-ai."""
     
@@ -30,21 +87,45 @@ class WatsonXModel(Model):
         credentials: dict | Credentials,
         project_id: str | None = None,
         space_id: str | None = None,
+        http_limits: httpx.Limits | None = None,
+        http_timeout: float = 120.0,
     ):
-        """Initialize WatsonX.ai model."""
+        """Initialize WatsonX.ai model.
+
+        A single pooled ``httpx.AsyncClient`` is shared by every agent built
+        from this model so concurrent ``achat`` calls reuse connections
+        instead of queueing behind httpx's default pool limits.
+        """
         self.model_id = model_id
         self.credentials = credentials
         self.project_id = project_id
         self.space_id = space_id
         
+        # Shared async connection pool for all requests made by this model
+        self._http_client = httpx.AsyncClient(
+            limits=http_limits or httpx.Limits(
+                max_connections=2000,
+                max_keepalive_connections=1500
+            ),
+            timeout=http_timeout
+        )
+        api_client = APIClient(
+            credentials=credentials,
+            project_id=project_id,
+            space_id=space_id,
+            async_httpx_client=self._http_client
+        )
+        
         # Initialize the WatsonX.ai model inference
         self.model = WatsonModelInference(
             model_id=model_id,
-            credentials=credentials,
-            project_id=project_id,
-            space_id=space_id
+            api_client=api_client
         )
 
+    async def aclose(self) -> None:
+        """Close the shared HTTP connection pool."""
+        await self._http_client.aclose()
+
     def name(self) -> str:
         """Get the name of the model."""
         return f"watsonx:{self.model_id}"
@@ -81,35 +162,44 @@ class WatsonXAgentModel(AgentModel):
 
     def _convert_part_to_watson_format(self, part: Any) -> dict:
         """Convert a single part to WatsonX.ai format."""
-        if hasattr(part, 'part_kind'):
-            if part.part_kind == 'system-prompt':
-                return {"role": "system", "content": part.content}
-            elif part.part_kind == 'user-prompt':
-                return {"role": "user", "content": part.content}
-            elif part.part_kind == 'tool-return':
-                # For tool returns, we'll format them as assistant responses
-                return {"role": "assistant", "content": part.model_response_str()}
-            elif part.part_kind == 'retry-prompt':
-                # For retry prompts, we'll format them as user messages
-                if isinstance(part.content, str):
-                    content = part.content
-                else:
-                    content = part.model_response()
-                return {"role": "user", "content": content}
-        
-        # Default fallback
-        return {"role": "user", "content": str(getattr(part, 'content', str(part)))}
+        handler = _KIND_HANDLERS.get(getattr(part, 'part_kind', None), _unknown_part_to_watson)
+        return handler(part)
 
     def _convert_request_to_watson_format(self, msg: ModelMessage) -> list[dict]:
         """Convert a ModelMessage to WatsonX.ai format."""
-        if hasattr(msg, 'parts'):
-            return [
-                self._convert_part_to_watson_format(part) 
-                for part in msg.parts
-            ]
+        parts = getattr(msg, 'parts', _MISSING)
+        if parts is not _MISSING:
+            return list(map(self._convert_part_to_watson_format, parts))
         # Fallback if we get an unexpected message type
         return [{"role": "user", "content": str(msg)}]
 
+    def _convert_messages_to_watson_format(self, messages: list[ModelMessage]) -> list[dict]:
+        """Convert and flatten a list of ModelMessages to WatsonX.ai format."""
+        return list(chain.from_iterable(
+            map(self._convert_request_to_watson_format, messages)
+        ))
+
+    def _process_chat_response(self, response: dict) -> tuple[ModelResponse, Usage]:
+        """Convert a WatsonX.ai chat response to pydantic-ai response and usage."""
+        message = response["choices"][0]["message"]
+        usage_data = response.get("usage") or _EMPTY
+        
+        # Create the response parts from the generated text
+        parts = [TextPart(content=message["content"])]
+        
+        model_response = ModelResponse(
+            parts=parts,
+            model_name=self.model.model_id,
+            timestamp=datetime.now(timezone.utc)
+        )
+        
+        usage = Usage(
+            total_tokens=usage_data.get("total_tokens", 0),
+            cost=0.0  # WatsonX.ai might not provide cost information
+        )
+        
+        return model_response, usage
+
     async def request(
         self,
         messages: list[ModelMessage],
@@ -117,40 +207,37 @@ class WatsonXAgentModel(AgentModel):
     ) -> tuple[ModelResponse, Usage]:
         """Make a request to the WatsonX.ai model."""
         # Convert all messages to WatsonX.ai format
-        watson_messages = []
-        for msg in messages:
-            watson_messages.extend(self._convert_request_to_watson_format(msg))
+        watson_messages = self._convert_messages_to_watson_format(messages)
         
         # Make the request to WatsonX.ai
         response = await self.model.achat(messages=watson_messages)
         
-        # Get the generated text from the response
-        generated_text = response["choices"][0]["message"]["content"]
+        return self._process_chat_response(response)
+
+    async def batch_request(
+        self,
+        batches: list[list[ModelMessage]],
+        max_concurrency: int = 32,
+    ) -> list[tuple[ModelResponse, Usage]]:
+        """Make several independent requests to the WatsonX.ai model concurrently.
+
+        WatsonX.ai has no native batch endpoint, so each conversation is sent
+        as its own ``achat`` call with at most ``max_concurrency`` in flight.
+        Results are returned in the same order as ``batches``.
+        """
+        watson_batches = [
+            self._convert_messages_to_watson_format(messages) for messages in batches
+        ]
         
-        # Create the response parts
-        parts = [TextPart(content=generated_text)]
+        sem = asyncio.Semaphore(max_concurrency)
         
-        # Convert WatsonX.ai response to pydantic-ai format
-        model_response = ModelResponse(
-            parts=parts,
-            model_name=self.model.model_id,
-            timestamp=datetime.now()
-        )
+        async def _one(watson_messages: list[dict]) -> dict:
+            async with sem:
+                return await self.model.achat(messages=watson_messages)
         
-        # Create usage information
-        # WatsonX.ai might return different usage info
-        response_info = response.get("results", [{}])[0]
-        total_tokens = (
-            response_info.get("input_token_count", 0) +
-            response_info.get("generated_token_count", 0)
-        )
+        responses = await asyncio.gather(*(_one(m) for m in watson_batches))
         
-        usage = Usage(
-            total_tokens=total_tokens,
-            cost=0.0  # WatsonX.ai might not provide cost information
-        )
-        
-        return model_response, usage
+        return [self._process_chat_response(response) for response in responses]
 
     @asynccontextmanager
     async def request_stream(
@@ -160,9 +247,7 @@ class WatsonXAgentModel(AgentModel):
     ) -> AsyncIterator[StreamedResponse]:
         """Make a streaming request to the WatsonX.ai model."""
         # Convert messages to WatsonX.ai format
-        watson_messages = []
-        for msg in messages:
-            watson_messages.extend(self._convert_request_to_watson_format(msg))
+        watson_messages = self._convert_messages_to_watson_format(messages)
         
         # Create streaming response
         stream = WatsonXStreamedResponse(
@@ -183,42 +268,116 @@ class WatsonXStreamedResponse(StreamedResponse):
         self,
         model: WatsonModelInference,
         messages: list[dict],
-        model_name: str
+        model_name: str,
+        flush_tokens: int = 8,
+        flush_ms: int = 20
     ):
+        """Initialize the streamed response.
+
+        Tokens are coalesced into one stream event once ``flush_tokens``
+        deltas have accumulated or ``flush_ms`` milliseconds have passed
+        since the last event, whichever comes first. The time limit also
+        applies while the model is stalled between tokens.
+        """
         super().__init__(model_name=model_name)
         self.model = model
         self.messages = messages
-        self._timestamp = datetime.now()
+        self.flush_tokens = flush_tokens
+        self.flush_ms = flush_ms
+        # Take a cheap snapshot; the datetime is only built if requested
+        self._t_ns = time.time_ns()
 
     async def _get_event_iterator(self) -> AsyncIterator[ModelResponseStreamEvent]:
         """Get async iterator for stream events."""
-        # Use WatsonX.ai chat_stream method
-        stream = self.model.chat_stream(messages=self.messages)
-        
-        for chunk in stream:
-            if "choices" in chunk and chunk["choices"]:
-                content = chunk["choices"][0].get("delta", {}).get("content", "")
-                if content:
-                    # Update usage if available
-                    if "usage" in chunk:
-                        total_tokens = (
-                            chunk.get("input_token_count", 0) +
-                            chunk.get("generated_token_count", 0)
-                        )
-                        self._usage = Usage(
-                            total_tokens=total_tokens,
-                            cost=0.0
-                        )
-                    
-                    # Add content to parts manager
-                    self._parts_manager.append_part(content)
-                    
-                    # Yield the stream event
-                    yield ModelResponseStreamEvent(
-                        type="content",
-                        content=content
+        # Use the async WatsonX.ai stream so the event loop is not blocked
+        # between tokens
+        stream = await self.model.achat_stream(messages=self.messages)
+        
+        # A single reader task drains the SDK stream into a queue so the
+        # consumer can stop waiting at the flush deadline without
+        # interrupting the stream itself
+        queue: asyncio.Queue = asyncio.Queue()
+        
+        async def _read() -> None:
+            try:
+                async for chunk in stream:
+                    queue.put_nowait(chunk)
+            except Exception as e:
+                queue.put_nowait(e)
+            else:
+                queue.put_nowait(_MISSING)
+        
+        reader = asyncio.create_task(_read())
+        
+        loop = asyncio.get_running_loop()
+        flush_after = self.flush_ms / 1000
+        buffer: list[str] = []
+        last_flush = loop.time()
+        
+        try:
+            while True:
+                if not queue.empty():
+                    chunk = queue.get_nowait()
+                elif buffer:
+                    # Only bound the wait while tokens are buffered
+                    try:
+                        async with asyncio.timeout_at(last_flush + flush_after):
+                            chunk = await queue.get()
+                    except TimeoutError:
+                        # The model stalled past the deadline; flush what we have
+                        last_flush = loop.time()
+                        yield self._flush(buffer)
+                        continue
+                else:
+                    chunk = await queue.get()
+                
+                if chunk is _MISSING:
+                    break
+                if isinstance(chunk, Exception):
+                    raise chunk
+                
+                choices = chunk.get("choices")
+                if not choices:
+                    continue
+                content = (choices[0].get("delta") or _EMPTY).get("content")
+                if not content:
+                    continue
+                
+                # Update usage if available
+                if "usage" in chunk:
+                    total_tokens = (
+                        chunk.get("input_token_count", 0) +
+                        chunk.get("generated_token_count", 0)
+                    )
+                    self._usage = Usage(
+                        total_tokens=total_tokens,
+                        cost=0.0
                     )
+                
+                buffer.append(content)
+                now = loop.time()
+                if len(buffer) < self.flush_tokens and now - last_flush < flush_after:
+                    continue
+                
+                last_flush = now
+                yield self._flush(buffer)
+        finally:
+            reader.cancel()
+        
+        # Flush whatever is left once the stream ends
+        if buffer:
+            yield self._flush(buffer)
+
+    def _flush(self, buffer: list[str]) -> ModelResponseStreamEvent:
+        """Add the coalesced buffer to the parts manager as one event."""
+        content = "".join(buffer)
+        buffer.clear()
+        self._parts_manager.append_part(content)
+        return ModelResponseStreamEvent(
+            type="content",
+            content=content
+        )
 
     def timestamp(self) -> datetime:
         """Get timestamp of the response."""
-        return self._timestamp
+        return datetime.fromtimestamp(self._t_ns / 1e9, tz=timezone.utc)
@@ -1,20 +1,43 @@
+from typing import Callable, Dict
+
 from phi.agent import Agent
+from phi.model.base import Model
 from phi.model.ollama import Ollama
 from phi.model.vertexai import Gemini
 from pdf_analyst.utilities.config_loader import load_config  # Add config loader import
+from pdf_analyst.utilities.ollama_client import get_ollama_client
+
+
+def _build_ollama(config: dict) -> Model:
+    return Ollama(id=config["model_id"], client=get_ollama_client())
+
+
+def _build_gemini(config: dict) -> Model:
+    return Gemini()
+
+
+# Model builders keyed by the "model" value in the config
+_MODEL_BUILDERS: Dict[str, Callable[[dict], Model]] = {
+    "ollama": _build_ollama,
+    "gemini": _build_gemini,
+}
+
 
 class BaseAgent(Agent):
     def __init__(self):
         super().__init__()
         config = load_config()  # Use the shared config loader
         self.set_model(config)
+
+    @classmethod
+    def register_model(cls, model_type: str, builder: Callable[[dict], Model]) -> None:
+        _MODEL_BUILDERS[model_type] = builder
     
     def set_model(self, config):
         model_type = config["model"]  # Direct access since we know it exists
         
-        if model_type == "ollama":
-            self.model = Ollama(id=config["model_id"])
-        elif model_type == "gemini":
-            self.model = Gemini()
-        else:
-            raise ValueError(f"Unknown model: {model_type}")
\ No newline at end of file
+        try:
+            builder = _MODEL_BUILDERS[model_type]
+        except KeyError:
+            raise ValueError(f"Unknown model: {model_type}") from None
+        self.model = builder(config)
@@ -1,7 +1,8 @@
+import csv
 import logging
 from pathlib import Path
 
-import pandas as pd
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
 
 from .models import Category
@@ -17,7 +18,7 @@ def load_category_seeds(
     Load category seed data from a CSV file into the database.
 
     Reads category data from a CSV file and inserts it into the database
-    using SQLAlchemy bulk insert.
+    using a single SQLAlchemy Core bulk insert.
 
     Args:
         session (Session): SQLAlchemy database session.
@@ -29,37 +30,29 @@ def load_category_seeds(
         Exception: If any unexpected error occurs during data loading.
     """
     try:
-        # Read CSV file with specified data types
-        df = pd.read_csv(
-            csv_path,
-            dtype={
-                "category_id": int,
-                "category_name": str,
-                "description": str,
-                "answer_format": str,
-                "group_id": int,
-            },
-        )
-
-        # Prepare category objects for bulk insert
+        # Read CSV rows ("utf-8-sig" strips the BOM written by Excel)
+        with open(csv_path, newline="", encoding="utf-8-sig") as file:
+            rows = list(csv.DictReader(file))
+
+        # Prepare plain row dicts for a Core bulk insert
         categories = [
-            Category(
-                id=row["category_id"],
-                name=row["category_name"],
-                description=row["description"],
-                answer_format=row["answer_format"],
-                group_id=row["group_id"],
-            )
-            for _, row in df.iterrows()
+            {
+                "id": int(row["category_id"]),
+                "name": row["category_name"],
+                "description": row["description"],
+                "answer_format": row["answer_format"],
+                "group_id": int(row["group_id"]),
+            }
+            for row in rows
         ]
 
-        # Insert categories into the database
-        session.bulk_save_objects(categories)
+        # Insert categories into the database in a single executemany
+        session.execute(insert(Category), categories)
         session.commit()
 
         logger.info(f"Loaded {len(categories)} categories from seed file.")
 
-    except pd.errors.ParserError as pe:
+    except csv.Error as pe:
         logger.error(f"CSV parsing error: {pe}")
         raise ValueError("Invalid CSV file format.") from pe
     except Exception as e:
@@ -101,10 +94,11 @@ if __name__ == "__main__":
 
     # Query database to verify loaded categories
     with get_db() as session:
-        categories = session.query(Category).all()
+        # Select only the printed columns; no ORM objects are built
+        categories = session.execute(select(Category.name, Category.group_id)).all()
         print("\nLoaded Categories:")
-        for cat in categories:
+        for name, group_id in categories:
             print(
-                f"  - {cat.name} "
-                f"(Group {cat.group_id if cat.group_id != 0 else 'None'})"
+                f"  - {name} "
+                f"(Group {group_id if group_id != 0 else 'None'})"
             )
@@ -1,10 +1,26 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
 
-from sqlalchemy import DateTime, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import DateTime, Float, ForeignKey, Index, Integer, String, Text, func
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
+def _utc_now() -> datetime:
+    """
+    Returns the current time in UTC.
+
+    Used as the client-side timestamp default so databases created before
+    the server-side default existed still receive a value on insert. Because
+    SQLAlchemy always binds this value, ORM and Core inserts never fall back
+    to ``server_default``; that default only applies to rows written with
+    raw SQL against tables created from these models.
+
+    Returns:
+        datetime: Timezone-aware current UTC time.
+    """
+    return datetime.now(timezone.utc)
+
+
 class Base(DeclarativeBase):
     """Base class for all SQLAlchemy ORM models."""
 
@@ -30,6 +46,7 @@ class Category(Base):
     """
 
     __tablename__ = "categories"
+    __table_args__ = (Index("ix_category_group", "group_id"),)
 
     # Primary key
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -63,7 +80,10 @@ class Category(Base):
 
     # Metadata
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, nullable=False, default=datetime.utcnow
+        DateTime(timezone=True),
+        nullable=False,
+        default=_utc_now,
+        server_default=func.now(),
     )
 
     def __repr__(self) -> str:
@@ -93,6 +113,9 @@ class AnalysisResult(Base):
     """
 
     __tablename__ = "analysis_results"
+    # contract_path lookups are served by the primary key; this covers
+    # per-category queries ordered by confidence (scanned in either direction)
+    __table_args__ = (Index("ix_analysis_category_conf", "category_id", "confidence"),)
 
     # Composite primary key (contract path and category)
     contract_path: Mapped[str] = mapped_column(
@@ -120,9 +143,10 @@ class AnalysisResult(Base):
 
     # Metadata
     analyzed_at: Mapped[datetime] = mapped_column(
-        DateTime,
+        DateTime(timezone=True),
         nullable=False,
-        default=datetime.utcnow,
+        default=_utc_now,
+        server_default=func.now(),
         comment="Timestamp of when the analysis was performed.",
     )
 
@@ -2,7 +2,7 @@ import logging
 from contextlib import contextmanager
 from pathlib import Path
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import Session, sessionmaker
 
 from .models import Base  # Ensure models.py contains SQLAlchemy models
@@ -10,6 +10,27 @@ from .models import Base  # Ensure models.py contains SQLAlchemy models
 logger = logging.getLogger(__name__)
 
 
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """
+    Applies per-connection SQLite pragmas for concurrent, low-fsync writes.
+
+    WAL lets readers proceed during writes, ``synchronous=NORMAL`` drops the
+    fsync on every commit (safe under WAL), and ``busy_timeout`` waits for a
+    competing writer instead of failing immediately with ``SQLITE_BUSY``.
+
+    Args:
+        dbapi_connection: Raw DB-API connection being opened.
+        connection_record: SQLAlchemy pool record for the connection.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.close()
+
+
 class DatabaseSession:
     """Manages SQLite database connections and sessions."""
 
@@ -31,6 +52,7 @@ class DatabaseSession:
 
         # Create the SQLAlchemy engine
         self.engine = create_engine(f"sqlite:///{self.db_path}")
+        event.listen(self.engine, "connect", _set_sqlite_pragmas)
 
         # Configure session factory
         self.SessionLocal = sessionmaker(
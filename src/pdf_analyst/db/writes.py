@@ -0,0 +1,60 @@
+import logging
+from typing import Any, Dict, List
+
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from .models import AnalysisResult
+
+logger = logging.getLogger(__name__)
+
+# Rows per executemany; keeps statements well under SQLite's variable limit
+BATCH_SIZE = 500
+
+
+def bulk_upsert_analysis_results(
+    session: Session, rows: List[Dict[str, Any]]
+) -> None:
+    """
+    Insert or update many analysis results in one transaction.
+
+    Rows are keyed on (contract_path, category_id); an existing result for
+    the same contract and category has its answer, confidence, extracted
+    text and timestamp replaced. Callers should accumulate results and flush
+    them here in batches rather than committing row by row.
+
+    Args:
+        session (Session): SQLAlchemy session used for the write.
+        rows (List[Dict[str, Any]]): Analysis results with the keys
+            contract_path, category_id, answer, confidence and optionally
+            extracted_text.
+
+    Raises:
+        Exception: If the write fails; the transaction is rolled back.
+    """
+    if not rows:
+        return
+
+    stmt = insert(AnalysisResult)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["contract_path", "category_id"],
+        set_={
+            "answer": stmt.excluded.answer,
+            "confidence": stmt.excluded.confidence,
+            "extracted_text": stmt.excluded.extracted_text,
+            "analyzed_at": stmt.excluded.analyzed_at,
+        },
+    )
+
+    # Every row must bind the same columns for executemany
+    rows = [{"extracted_text": None, **row} for row in rows]
+
+    try:
+        for start in range(0, len(rows), BATCH_SIZE):
+            session.execute(stmt, rows[start : start + BATCH_SIZE])
+        session.commit()
+        logger.info(f"Upserted {len(rows)} analysis results")
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Failed to upsert analysis results: {e}")
+        raise
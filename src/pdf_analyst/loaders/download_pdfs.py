@@ -1,6 +1,10 @@
 import os
 import requests
+import shutil
+import tempfile
+import urllib3
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # URL to download the dataset
@@ -8,6 +12,44 @@ ZIP_URL = "https://zenodo.org/records/4595826/files/CUAD_v1.zip?download=1"
 ZIP_DIR = Path("data/pdfs")  # Destination directory
 ZIP_PATH = ZIP_DIR / "CUAD_v1.zip"  # Path to store the zip file
 EXTRACT_DIR = ZIP_DIR  # Extract files into 'data/pdfs/'
+# Bytes read from the HTTP stream per iteration (default 1 MiB)
+CHUNK_SIZE = int(os.getenv("PDF_ANALYST_DOWNLOAD_CHUNK", 1024 * 1024))
+SPOOL_MAX_SIZE = 512 * 1024 * 1024  # Spill the download to disk beyond this
+# Also keep the downloaded ZIP at ZIP_PATH
+KEEP_ZIP = os.getenv("PDF_ANALYST_KEEP_ZIP", "").lower() in ("1", "true", "yes")
+
+
+def extract_members(zip_ref: zipfile.ZipFile, target_dir: Path) -> None:
+    """
+    Extracts every member of an open ZIP archive using a pool of threads.
+
+    zlib releases the GIL while inflating, so independent members are
+    decompressed and written in parallel. Directories are created up front
+    so the worker threads never race on creating the same parent folder.
+    Files already on disk with the member's uncompressed size are skipped,
+    so re-running the extraction only writes what is missing or changed.
+
+    Args:
+        zip_ref (zipfile.ZipFile): Archive opened for reading.
+        target_dir (Path): Directory to extract the members into.
+    """
+    members = zip_ref.infolist()
+    files = []
+    for member in members:
+        if member.is_dir():
+            zip_ref.extract(member, target_dir)
+            continue
+        destination = target_dir / member.filename
+        if destination.is_file() and destination.stat().st_size == member.file_size:
+            continue
+        files.append(member)
+        parent = Path(member.filename).parent
+        if not parent.is_absolute() and ".." not in parent.parts:
+            (target_dir / parent).mkdir(parents=True, exist_ok=True)
+
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        # list() re-raises the first error from any worker
+        list(executor.map(lambda member: zip_ref.extract(member, target_dir), files))
 
 
 def download_and_unzip():
@@ -15,8 +57,10 @@ def download_and_unzip():
     Downloads the CUAD_v1.zip dataset from the specified URL and extracts it 
     into the 'data/pdfs/' directory.
 
-    The function ensures that the target directory exists, downloads the 
-    dataset, saves it as a ZIP file, and then extracts its contents.
+    The download is spooled into a temporary file (kept in memory up to
+    512 MiB) and extracted straight from there, so the archive is not
+    written to disk and read back. Set PDF_ANALYST_KEEP_ZIP=1 to save the
+    ZIP file to 'data/pdfs/CUAD_v1.zip' as well.
 
     Raises:
         requests.exceptions.RequestException: If an error occurs during 
@@ -27,7 +71,7 @@ def download_and_unzip():
     ZIP_DIR.mkdir(parents=True, exist_ok=True)  # Ensure 'data/pdfs/' exists
 
     # Download the ZIP file
-    print(f"Downloading CUAD_v1.zip to {ZIP_PATH}...")
+    print(f"Downloading CUAD_v1.zip to {ZIP_PATH if KEEP_ZIP else 'a temporary file'}...")
     try:
         response = requests.get(ZIP_URL, stream=True)
         response.raise_for_status()  # Raise an error for bad responses (4xx or 5xx)
@@ -37,25 +81,41 @@ def download_and_unzip():
 
     # Save the ZIP file
     try:
-        with open(ZIP_PATH, "wb") as file:
-            for chunk in response.iter_content(chunk_size=8192):
-                file.write(chunk)
-        print(f"Downloaded {ZIP_PATH}")
-    except OSError as e:
-        print(f"Error writing file: {e}")
-        return
+        if KEEP_ZIP:
+            archive = open(ZIP_PATH, "w+b")
+        else:
+            archive = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+        with archive:
+            # Copy straight from the raw stream, skipping iter_content's
+            # per-chunk generator; still undo any gzip transfer encoding
+            try:
+                response.raw.decode_content = True
+                shutil.copyfileobj(response.raw, archive, length=CHUNK_SIZE)
+            except urllib3.exceptions.HTTPError as e:
+                # Dropped connections and read timeouts from the raw stream
+                # are urllib3 errors, not OSErrors
+                print(f"Error downloading file: {e}")
+                archive.close()
+                if KEEP_ZIP:
+                    ZIP_PATH.unlink(missing_ok=True)  # Don't leave a partial ZIP
+                return
+            archive.seek(0)
+            print("Download complete.")
 
-    # Extract ZIP file
-    print(f"Extracting to {EXTRACT_DIR}...")
-    try:
-        with zipfile.ZipFile(ZIP_PATH, "r") as zip_ref:
-            zip_ref.extractall(EXTRACT_DIR)
-        print("Extraction complete.")
-    except zipfile.BadZipFile as e:
-        print(f"Error extracting ZIP file: {e}")
-        return
+            # Extract ZIP file
+            print(f"Extracting to {EXTRACT_DIR}...")
+            try:
+                with zipfile.ZipFile(archive, "r") as zip_ref:
+                    extract_members(zip_ref, EXTRACT_DIR)
+                print("Extraction complete.")
+            except zipfile.BadZipFile as e:
+                print(f"Error extracting ZIP file: {e}")
+                return
+            except OSError as e:
+                print(f"Error during extraction: {e}")
+                return
     except OSError as e:
-        print(f"Error during extraction: {e}")
+        print(f"Error writing file: {e}")
         return
 
 
@@ -19,8 +19,14 @@ Attributes:
     knowledge_base (PDFUrlKnowledgeBase): Stores and retrieves PDF content.
 
 Functions:
-    pdf_agent(user: str = "user") -> None:
-        Runs an interactive chatbot session with the PDF knowledge base.
+    get_knowledge_base_service() -> KnowledgeBaseService:
+        Builds the knowledge base service once, on first use.
+    get_agent() -> PDFAgent:
+        Builds the PDF agent once, on first use.
+    pdf_agent(user: str = "user", reload: bool = False) -> None:
+        Runs an interactive chatbot session with the PDF knowledge base,
+        embedding the PDFs only if the vector store is empty or --reload
+        is passed.
 
 Usage:
     Run this script to start an interactive chatbot session. Type queries
@@ -33,25 +39,53 @@ Example:
     ```
 """
 
-__import__("pysqlite3")
 import sys
-
-sys.modules["sqlite3"] = sys.modules.pop("pysqlite3")
-import sqlite3
-from typing import Optional
+import threading
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional
 
 import typer
 from rich.prompt import Prompt
 
-from .services.knowledge_base import KnowledgeBaseService
-from .agents.pdf_agent import PDFAgent
+if TYPE_CHECKING:
+    from .agents.pdf_agent import PDFAgent
+    from .services.knowledge_base import KnowledgeBaseService
+
+
+def _install_pysqlite3() -> None:
+    """Use pysqlite3's newer SQLite for Chroma; must run before chromadb is imported."""
+    try:
+        import pysqlite3
+    except ImportError:
+        return
+    sys.modules["sqlite3"] = pysqlite3
+
+
+@lru_cache(maxsize=1)
+def get_knowledge_base_service() -> "KnowledgeBaseService":
+    """Initialize the knowledge base service on first use."""
+    # Imported here so the sqlite3 swap happens before chromadb loads
+    from .services.knowledge_base import KnowledgeBaseService
+
+    return KnowledgeBaseService()
 
-# Initialize and load the knowledge base
-knowledge_base_service = KnowledgeBaseService()
-knowledge_base_service.load_knowledge_base(recreate=True)
+@lru_cache(maxsize=1)
+def get_agent() -> "PDFAgent":
+    """Build the PDF agent, and its model client, once per process."""
+    from .agents.pdf_agent import PDFAgent
 
-def pdf_agent(user: str = "user") -> None:
-    agent = PDFAgent(knowledge_base=knowledge_base_service.knowledge_base)
+    return PDFAgent(knowledge_base=get_knowledge_base_service().knowledge_base)
+
+def pdf_agent(user: str = "user", reload: bool = False) -> None:
+    _install_pysqlite3()
+
+    knowledge_base_service = get_knowledge_base_service()
+    # Embeds the PDFs only with --reload or when nothing is stored yet
+    knowledge_base_service.load_knowledge_base(recreate=reload)
+    # Warm the index while the user types their first question
+    threading.Thread(target=knowledge_base_service.warm_up, daemon=True).start()
+
+    agent = get_agent()
     run_id = getattr(agent, 'run_id', None)  # Initialize run_id
 
     if run_id is None:
@@ -60,11 +94,24 @@ def pdf_agent(user: str = "user") -> None:
     else:
         print(f"Continuing Run: {run_id}\n")
 
+    # Piped input (scripts, batch runs) skips rich's prompt rendering
+    interactive = sys.stdin.isatty()
+
     while True:
-        message = Prompt.ask(f"[bold] :sunglasses: {user} [/bold]")
+        try:
+            if interactive:
+                message = Prompt.ask(f"[bold] :sunglasses: {user} [/bold]")
+            else:
+                line = sys.stdin.readline()
+                if not line:
+                    raise EOFError
+                message = line.rstrip()
+        except (EOFError, KeyboardInterrupt):
+            print("\nGoodbye!")
+            break
         if message.lower() in ("exit", "bye"):
             break
-        agent.print_response(message)
+        agent.print_response(message, stream=bool(agent.stream))
 
 if __name__ == "__main__":
     # typer.run(pdf_agent)
@@ -1,6 +1,233 @@
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from hashlib import blake2b
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from ollama import ResponseError
+from pydantic import Field, PrivateAttr
+from phi.embedder import Embedder
 from phi.embedder.google import GeminiEmbedder
 from phi.embedder.ollama import OllamaEmbedder
 from pdf_analyst.utilities.config_loader import load_config  # Use absolute import
+from pdf_analyst.utilities.ollama_client import get_ollama_client
+
+# On-disk embedding cache shared across runs
+EMBED_CACHE_PATH = ".cache/embeds.sqlite"
+
+
+class BatchOllamaEmbedder(OllamaEmbedder):
+    """OllamaEmbedder that can embed many texts per request via /api/embed.
+
+    Up to ``concurrency`` batches (``EMBED_CONCURRENCY``, default 5) are in
+    flight at once so network time overlaps with remote compute. Falls back
+    to one /api/embeddings request per text when the server is too old to
+    provide the batch endpoint.
+    """
+
+    batch_size: int = 64
+    concurrency: int = Field(default_factory=lambda: int(os.getenv("EMBED_CONCURRENCY", "5")))
+    _legacy_endpoint: bool = False
+
+    def _embed_batch(self, client, batch: List[str], **kwargs) -> List[List[float]]:
+        if not self._legacy_endpoint:
+            try:
+                return client.embed(model=self.model, input=batch, **kwargs)["embeddings"]
+            except ResponseError as e:
+                # A missing model is also a 404, but its message names the
+                # model; only the router's "page not found" means no endpoint
+                if e.status_code != 404 or "page not found" not in str(e.error).lower():
+                    raise
+            # Remember the missing endpoint so later batches skip it
+            self._legacy_endpoint = True
+        # Call the client directly; phi's get_embedding turns errors into []
+        return [
+            client.embeddings(model=self.model, prompt=text, **kwargs)["embedding"]
+            for text in batch
+        ]
+
+    def get_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
+        kwargs: Dict[str, Any] = {}
+        if self.options is not None:
+            kwargs["options"] = self.options
+
+        client = self.client
+        batches = [
+            texts[start : start + self.batch_size]
+            for start in range(0, len(texts), self.batch_size)
+        ]
+        if len(batches) > 1 and self.concurrency > 1:
+            with ThreadPoolExecutor(max_workers=min(self.concurrency, len(batches))) as executor:
+                # map() keeps results in input order
+                results = list(
+                    executor.map(lambda batch: self._embed_batch(client, batch, **kwargs), batches)
+                )
+        else:
+            results = [self._embed_batch(client, batch, **kwargs) for batch in batches]
+        return [embedding for batch_embeddings in results for embedding in batch_embeddings]
+
+
+class BatchGeminiEmbedder(GeminiEmbedder):
+    """GeminiEmbedder that embeds up to ``batch_size`` texts per request.
+
+    ``embed_content`` accepts a list of texts and sends them through the
+    batchEmbedContents endpoint, which takes at most 100 texts per call.
+    """
+
+    batch_size: int = 64
+
+    def get_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
+        request_params: Dict[str, Any] = {
+            "model": self.model,
+            "output_dimensionality": self.dimensions,
+            "task_type": self.task_type,
+            "title": self.title,
+        }
+        if self.request_params:
+            request_params.update(self.request_params)
+
+        client = self.client
+        embeddings: List[List[float]] = []
+        for start in range(0, len(texts), self.batch_size):
+            batch = texts[start : start + self.batch_size]
+            response = client.embed_content(content=batch, **request_params)
+            embeddings.extend(response["embedding"])
+        return embeddings
+
+
+class CachedEmbedder(Embedder):
+    """Thread-safe LRU + TTL cache in front of another embedder.
+
+    Repeated texts, such as the same knowledge-base query issued several
+    times in one agent turn, are served from memory instead of re-embedded.
+    When ``path`` is set, document embeddings from ``get_embeddings_batch``
+    are also stored in a SQLite file keyed by model and content hash, so
+    unchanged chunks are not re-embedded when the knowledge base is rebuilt
+    in a later run. Query embeddings from ``get_embedding`` stay in memory
+    only. ``ttl_seconds`` applies to the in-memory tier; stored document
+    vectors are content-addressed, never go stale and are reloaded from the
+    file after they expire from memory.
+    """
+
+    embedder: Embedder
+    max_size: int = 2048
+    ttl_seconds: float = 3600
+    path: Optional[str] = None
+
+    _cache: "OrderedDict[Tuple[str, bytes], Tuple[float, List[float]]]" = PrivateAttr(
+        default_factory=OrderedDict
+    )
+    _lock: Any = PrivateAttr(default_factory=threading.RLock)
+    _db: Optional[sqlite3.Connection] = PrivateAttr(default=None)
+
+    def model_post_init(self, __context: Any) -> None:
+        self.dimensions = self.embedder.dimensions
+        if self.path is not None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            # Access is serialized by _lock, so the connection can be shared
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "model TEXT NOT NULL, key BLOB NOT NULL, vector BLOB NOT NULL, "
+                "PRIMARY KEY (model, key)) WITHOUT ROWID"
+            )
+            self._db.commit()
+
+    @property
+    def model(self) -> str:
+        return getattr(self.embedder, "model", "")
+
+    def _key(self, text: str) -> Tuple[str, bytes]:
+        # Same model at another dimensionality yields different vectors
+        model = f"{self.model}/{self.embedder.dimensions}"
+        return model, blake2b(text.encode(), digest_size=16).digest()
+
+    def _get(self, key: Tuple[str, bytes]) -> Optional[List[float]]:
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                expires_at, embedding = entry
+                if expires_at >= time.monotonic():
+                    self._cache.move_to_end(key)
+                    return embedding
+                del self._cache[key]
+            if self._db is None:
+                return None
+            row = self._db.execute(
+                "SELECT vector FROM embeddings WHERE model = ? AND key = ?", key
+            ).fetchone()
+            if row is None:
+                return None
+            # Vectors are stored as float32, the precision Chroma keeps anyway
+            embedding = array("f", row[0]).tolist()
+            self._remember(key, embedding)
+            return embedding
+
+    def _remember(self, key: Tuple[str, bytes], embedding: List[float]) -> None:
+        self._cache[key] = (time.monotonic() + self.ttl_seconds, embedding)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+
+    def _put(
+        self, items: Dict[Tuple[str, bytes], List[float]], persist: bool = False
+    ) -> None:
+        items = {key: embedding for key, embedding in items.items() if embedding}
+        if not items:
+            return
+        with self._lock:
+            for key, embedding in items.items():
+                self._remember(key, embedding)
+            if persist and self._db is not None:
+                # One transaction for the whole batch
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO embeddings (model, key, vector) VALUES (?, ?, ?)",
+                    [(*key, array("f", embedding).tobytes()) for key, embedding in items.items()],
+                )
+                self._db.commit()
+
+    def get_embedding(self, text: str) -> List[float]:
+        key = self._key(text)
+        embedding = self._get(key)
+        if embedding is None:
+            embedding = self.embedder.get_embedding(text)
+            self._put({key: embedding})
+        return embedding
+
+    def get_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
+        return self.get_embedding(text), None
+
+    def get_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
+        keys = [self._key(text) for text in texts]
+        embeddings = [self._get(key) for key in keys]
+
+        # Embed each distinct missing text once
+        missing: Dict[Tuple[str, bytes], str] = {
+            key: text for key, text, embedding in zip(keys, texts, embeddings) if embedding is None
+        }
+        if missing:
+            get_embeddings_batch = getattr(self.embedder, "get_embeddings_batch", None)
+            if get_embeddings_batch is not None:
+                fetched = get_embeddings_batch(list(missing.values()))
+            else:
+                fetched = [self.embedder.get_embedding(text) for text in missing.values()]
+            fetched_by_key = dict(zip(missing, fetched))
+            # Only document batches go to disk; one-off queries would grow
+            # the file without bound
+            self._put(fetched_by_key, persist=True)
+            embeddings = [
+                fetched_by_key[key] if embedding is None else embedding
+                for key, embedding in zip(keys, embeddings)
+            ]
+        return embeddings
+
 
 class EmbedderModel:
     def __init__(self):
@@ -8,8 +235,20 @@ class EmbedderModel:
         embedder_type = config["embedder"]  # Direct access since we know it exists
         
         if embedder_type == "ollama":
-            self.embedder = OllamaEmbedder()
+            embedder = BatchOllamaEmbedder(
+                model=config.get("embedder_id", "nomic-embed-text"),
+                dimensions=config.get("embedder_dimensions", 768),
+                ollama_client=get_ollama_client(),
+            )
         elif embedder_type == "gemini":
-            self.embedder = GeminiEmbedder()
+            # text-embedding-004 truncates to output_dimensionality
+            embedder = BatchGeminiEmbedder(dimensions=config.get("embedder_dimensions", 256))
         else:
-            raise ValueError(f"Unsupported embedder type: {embedder_type}")
\ No newline at end of file
+            raise ValueError(f"Unsupported embedder type: {embedder_type}")
+        self.embedder = CachedEmbedder(embedder=embedder, path=EMBED_CACHE_PATH)
+
+
+@lru_cache(maxsize=1)
+def get_embedder() -> Embedder:
+    """Return the process-wide embedder, built from the config on first use."""
+    return EmbedderModel().embedder
@@ -1,7 +1,116 @@
+import re
+from functools import lru_cache
+from hashlib import md5
+from typing import Any, Dict, List, Optional, Tuple
+
+from chromadb.config import Settings
+from phi.document import Document
+from phi.embedder import Embedder
 from phi.vectordb.chroma import ChromaDb
-from ..models.embedder import EmbedderModel
+from ..models.embedder import get_embedder
+from ..utilities.config_loader import load_config
+
+# Default HNSW index settings applied when the collection is first created;
+# override any of them under vector_db.hnsw in the config
+HNSW_METADATA = {
+    "hnsw:M": 16,
+    "hnsw:construction_ef": 200,
+    "hnsw:search_ef": 100,
+}
+
+# Largest number of records sent to Chroma in a single add/upsert call
+WRITE_BATCH_SIZE = 500
+
+
+class TunedChromaDb(ChromaDb):
+    """ChromaDb with explicit HNSW settings and batched document embedding."""
+
+    def __init__(self, *args: Any, hnsw: Optional[Dict[str, Any]] = None, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        # e.g. {"M": 16} -> {"hnsw:M": 16}
+        self.hnsw_metadata = {
+            **HNSW_METADATA,
+            **{f"hnsw:{key}": value for key, value in (hnsw or {}).items()},
+        }
+
+    def create(self) -> None:
+        if self.exists():
+            self._collection = self.client.get_collection(name=self.collection)
+            return
+        self._collection = self.client.create_collection(
+            name=self.collection,
+            metadata={"hnsw:space": self.distance.value, **self.hnsw_metadata},
+        )
+
+    def _prepare(
+        self, documents: List[Document]
+    ) -> Tuple[List[str], List[List[float]], List[str]]:
+        docs = [document.content.replace("\x00", "\ufffd") for document in documents]
+        ids = [md5(doc.encode()).hexdigest() for doc in docs]
+
+        # One request per batch instead of one per chunk, when supported
+        get_embeddings_batch = getattr(self.embedder, "get_embeddings_batch", None)
+        if get_embeddings_batch is not None:
+            embeddings = get_embeddings_batch([document.content for document in documents])
+            for document, embedding in zip(documents, embeddings):
+                document.embedding = embedding
+        else:
+            for document in documents:
+                document.embed(embedder=self.embedder)
+            embeddings = [document.embedding for document in documents]
+        return ids, embeddings, docs
+
+    def insert(
+        self, documents: List[Document], filters: Optional[Dict[str, Any]] = None
+    ) -> None:
+        if not documents or self._collection is None:
+            return super().insert(documents, filters)
+        ids, embeddings, docs = self._prepare(documents)
+        for start in range(0, len(ids), WRITE_BATCH_SIZE):
+            end = start + WRITE_BATCH_SIZE
+            self._collection.add(
+                ids=ids[start:end], embeddings=embeddings[start:end], documents=docs[start:end]
+            )
+
+    def upsert(
+        self, documents: List[Document], filters: Optional[Dict[str, Any]] = None
+    ) -> None:
+        if not documents or self._collection is None:
+            return super().upsert(documents, filters)
+        ids, embeddings, docs = self._prepare(documents)
+        for start in range(0, len(ids), WRITE_BATCH_SIZE):
+            end = start + WRITE_BATCH_SIZE
+            self._collection.upsert(
+                ids=ids[start:end], embeddings=embeddings[start:end], documents=docs[start:end]
+            )
+
+
+def collection_name(embedder: Embedder, prefix: str = "books") -> str:
+    """Name the collection after its embedding model and size.
+
+    Each environment's embedder then gets its own collection in the shared
+    store, so vectors of different models or dimensions are never mixed.
+    """
+    model = re.sub(r"[^A-Za-z0-9]+", "-", getattr(embedder, "model", "")).strip("-")
+    return f"{prefix}-{model}-{embedder.dimensions}"
+
 
 class VectorDbRepository:
     def __init__(self):
-        embedder_model = EmbedderModel()
-        self.vector_db = ChromaDb(collection="books", embedder=embedder_model.embedder, path="./tmp/chromadb")
\ No newline at end of file
+        config = load_config()
+        embedder = get_embedder()
+        self.vector_db = TunedChromaDb(
+            collection=collection_name(embedder),
+            embedder=embedder,
+            path="./tmp/chromadb",
+            persistent_client=True,
+            # Keep Chroma from posting usage telemetry on every client call
+            settings=Settings(anonymized_telemetry=False),
+            hnsw=config.get("vector_db", {}).get("hnsw"),
+        )
+
+
+@lru_cache(maxsize=1)
+def get_vector_db() -> TunedChromaDb:
+    """Return the process-wide vector store, created on first use."""
+    return VectorDbRepository().vector_db
@@ -1,13 +1,64 @@
+import asyncio
+import logging
+import os
+
 from phi.knowledge.pdf import PDFUrlKnowledgeBase
-from ..repositories.vector_db import VectorDbRepository
+from ..repositories.vector_db import get_vector_db
+
+logger = logging.getLogger(__name__)
 
 class KnowledgeBaseService:
     def __init__(self):
-        vector_db_repo = VectorDbRepository()
         self.knowledge_base = PDFUrlKnowledgeBase(
             urls=["https://phi-public.s3.amazonaws.com/recipes/ThaiRecipes.pdf"],
-            vector_db=vector_db_repo.vector_db,
+            vector_db=get_vector_db(),
         )
 
-    def load_knowledge_base(self, recreate: bool = True):
-        self.knowledge_base.load(recreate=recreate)
\ No newline at end of file
+    def is_loaded(self) -> bool:
+        vector_db = self.knowledge_base.vector_db
+        return vector_db.exists() and vector_db.get_count() > 0
+
+    def warm_up(self) -> None:
+        """Run a throwaway search so the HNSW index is in memory before the first query."""
+        try:
+            self.knowledge_base.vector_db.search("warmup", limit=1)
+        except Exception as e:
+            # Best effort; the first real search simply pays the load instead
+            logger.warning(f"Vector store warm-up failed: {e}")
+
+    def load_knowledge_base(self, recreate: bool = False):
+        # Reuse the persisted collection unless a rebuild is requested
+        if not recreate and self.is_loaded():
+            return
+        asyncio.run(self.aload_knowledge_base(recreate=recreate))
+
+    async def aload_knowledge_base(self, recreate: bool = False):
+        """Read, embed and store every PDF in the knowledge base concurrently.
+
+        At most KB_LOAD_CONCURRENCY (default 8) PDFs are in flight at once.
+        The Ollama server only runs that many embedding requests in parallel
+        if OLLAMA_NUM_PARALLEL allows it, and OLLAMA_MAX_LOADED_MODELS should
+        leave room for the embedding model next to the chat model.
+        """
+        knowledge_base = self.knowledge_base
+        vector_db = knowledge_base.vector_db
+        if recreate:
+            vector_db.drop()
+        vector_db.create()
+
+        sem = asyncio.Semaphore(int(os.getenv("KB_LOAD_CONCURRENCY", "8")))
+
+        async def _load_one(url: str):
+            async with sem:
+                documents = await asyncio.to_thread(knowledge_base.reader.read, url=url)
+                # Upsert skips phi's per-document doc_exists lookups
+                await asyncio.to_thread(vector_db.upsert, documents)
+
+        urls = []
+        for url in knowledge_base.urls:
+            if url.endswith(".pdf"):
+                urls.append(url)
+            else:
+                # Same check and message as PDFUrlKnowledgeBase.document_lists
+                logger.error(f"Unsupported URL: {url}")
+        await asyncio.gather(*(_load_one(url) for url in urls))
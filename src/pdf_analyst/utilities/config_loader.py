@@ -1,11 +1,23 @@
 import os
+from functools import lru_cache
+
 import yaml
 
+# libyaml's C loader when PyYAML was built with it; same safe semantics
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 def load_config():
-    environment = os.getenv("ENVIRONMENT", "dev")
+    return _load_config(os.getenv("ENVIRONMENT", "dev"))
+
+@lru_cache(maxsize=None)
+def _load_config(environment):
     config_file = f"src/pdf_analyst/config/{environment}_config.yml"
     
     with open(config_file, "r") as file:
-        config = yaml.safe_load(file)
+        config = yaml.load(file, Loader=_YamlLoader)
     
-    return config
\ No newline at end of file
+    return config
+
+def reload_config():
+    _load_config.cache_clear()
+    return load_config()
@@ -0,0 +1,21 @@
+from functools import lru_cache
+
+import httpx
+from ollama import Client
+
+@lru_cache(maxsize=1)
+def get_ollama_client():
+    # One client (and one keep-alive connection pool) shared by every Ollama
+    # model and embedder; the host comes from OLLAMA_HOST as usual
+    return Client(
+        timeout=httpx.Timeout(300.0, connect=10.0),
+        # Pool limits live on the transport once a custom one is supplied
+        transport=httpx.HTTPTransport(
+            retries=3,
+            limits=httpx.Limits(
+                max_keepalive_connections=40,
+                max_connections=100,
+                keepalive_expiry=30.0,
+            ),
+        ),
+    )